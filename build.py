@@ -0,0 +1,57 @@
+# Cross-compile the fish feeder to .mpy files (run on your computer, not the Pico)
+#
+# Requires mpy-cross matching your firmware version:  pip install mpy-cross
+# Usage:  python build.py [output_dir]
+# Then copy everything in output_dir (default: build/) to the Pico.
+import os
+import shutil
+import subprocess
+import sys
+
+# Libraries compiled as-is (ds3231.py is included when present)
+MODULES = ["ssd1306.py", "i2c_bus.py", "power.py", "ds3231.py"]
+
+# main.py is compiled as feeder.mpy and started from a two-line main.py,
+# because MicroPython only runs main.py from source
+APP_SOURCE = "main.py"
+APP_MODULE = "feeder"
+BOOT_STUB = "import {0}\n{0}.main()\n".format(APP_MODULE)
+
+def mpy_cross():
+    """Return the command used to run mpy-cross"""
+    exe = shutil.which("mpy-cross")
+    if exe:
+        return [exe]
+    try:
+        import mpy_cross  # noqa: F401  (pip package)
+    except ImportError:
+        sys.exit("mpy-cross not found, install it with: pip install mpy-cross")
+    return [sys.executable, "-m", "mpy_cross"]
+
+def compile_module(cmd, source, target, name):
+    subprocess.run(cmd + ["-march=armv6m", "-s", name, "-o", target, source], check=True)
+    print("{:<14} -> {:<14} {:>6} B (source {} B)".format(
+        os.path.basename(source), os.path.basename(target), os.path.getsize(target), os.path.getsize(source)))
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, "build"))
+    os.makedirs(out, exist_ok=True)
+    cmd = mpy_cross()
+
+    for source in MODULES:
+        path = os.path.join(here, source)
+        if not os.path.exists(path):
+            print("{:<14} skipped (not found)".format(source))
+            continue
+        name = source[:-3]
+        compile_module(cmd, path, os.path.join(out, name + ".mpy"), source)
+
+    compile_module(cmd, os.path.join(here, APP_SOURCE),
+                   os.path.join(out, APP_MODULE + ".mpy"), APP_MODULE + ".py")
+    with open(os.path.join(out, "main.py"), "w") as f:
+        f.write(BOOT_STUB)
+    print("Boot stub written to", os.path.join(out, "main.py"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# Shared I2C bus manager for MicroPython
+from micropython import const
+from machine import Pin, I2C
+import errno
+import time
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+_RETRIES = const(1)  # retries after a bus recovery
+_RECOVERY_CLOCKS = const(9)  # enough to finish any byte a slave is stuck in
+
+class I2CBus:
+    """Drop-in replacement for machine.I2C shared by several drivers.
+
+    Every transaction runs under one lock. Bulk writes to addresses
+    registered with coalesce() are held back until flush(), which the main
+    loop calls once per iteration after all its reads. Short reads (e.g.
+    the RTC) therefore never wait behind a 1 KB display transfer, and
+    several redraws in one iteration are sent as a single frame. On a
+    stuck bus a failed transaction clocks SCL to free the slave, re-creates
+    the peripheral and is retried once; a plain NACK from a missing device
+    is counted and raised without touching the bus.
+    """
+
+    def __init__(self, bus_id, scl, sda, freq=400000):
+        self.bus_id = bus_id
+        self.scl = scl
+        self.sda = sda
+        self.freq = freq
+        self.recoveries = 0
+        self._lock = _thread.allocate_lock() if _thread else None
+        self._coalesced = set()
+        self._pending = {}  # addr -> (vector, stop) of the latest deferred write
+        self._stats = {}  # addr -> [transactions, errors, bytes]
+        self._start = time.ticks_ms()
+        self._clear_bus()
+        self._i2c = self._make_i2c()
+        self.devices = self._i2c.scan()  # cached at boot
+
+    def _make_i2c(self):
+        return I2C(self.bus_id, scl=Pin(self.scl), sda=Pin(self.sda), freq=self.freq)
+
+    def _clear_bus(self):
+        """Clock SCL until SDA is released, then generate a STOP"""
+        scl = Pin(self.scl, Pin.OPEN_DRAIN, value=1)
+        sda = Pin(self.sda, Pin.IN, Pin.PULL_UP)
+        for _ in range(_RECOVERY_CLOCKS):
+            if sda.value():
+                break
+            scl.value(0)
+            time.sleep_us(5)
+            scl.value(1)
+            time.sleep_us(5)
+        scl.value(0)
+        sda = Pin(self.sda, Pin.OPEN_DRAIN, value=0)
+        time.sleep_us(5)
+        scl.value(1)
+        time.sleep_us(5)
+        sda.value(1)
+        time.sleep_us(5)
+
+    def recover(self):
+        """Free a stuck bus and re-create the I2C peripheral"""
+        if self._lock:
+            self._lock.acquire()
+        try:
+            self._recover()
+        finally:
+            if self._lock:
+                self._lock.release()
+
+    def _recover(self):
+        self.recoveries += 1
+        self._clear_bus()
+        self._i2c = self._make_i2c()
+
+    def _stuck(self, error):
+        """True if the bus is hung rather than a device NACKing"""
+        return error.args[0] == errno.ETIMEDOUT or not Pin(self.sda).value()
+
+    def _count(self, addr, nbytes, error):
+        entry = self._stats.get(addr)
+        if entry is None:
+            entry = self._stats[addr] = [0, 0, 0]
+        entry[0] += 1
+        if error:
+            entry[1] += 1
+        else:
+            entry[2] += nbytes
+
+    def _run(self, addr, nbytes, method, *args):
+        if self._lock:
+            self._lock.acquire()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = getattr(self._i2c, method)(*args)
+                    self._count(addr, nbytes, False)
+                    return result
+                except OSError as e:
+                    self._count(addr, 0, True)
+                    if attempt >= _RETRIES or not self._stuck(e):
+                        raise
+                    attempt += 1
+                    self._recover()
+        finally:
+            if self._lock:
+                self._lock.release()
+
+    def scan(self, refresh=False):
+        if refresh:
+            self.devices = self._run(None, 0, "scan")
+        return self.devices
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self._run(addr, nbytes, "readfrom", addr, nbytes, stop)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        return self._run(addr, len(buf), "readfrom_into", addr, buf, stop)
+
+    def writeto(self, addr, buf, stop=True):
+        return self._run(addr, len(buf), "writeto", addr, buf, stop)
+
+    def writevto(self, addr, vector, stop=True):
+        if addr in self._coalesced:
+            # Copy the vector: drivers such as SSD1306 reuse the list object
+            self._pending[addr] = (tuple(vector), stop)
+            return
+        return self._run(addr, sum(len(b) for b in vector), "writevto", addr, vector, stop)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        return self._run(addr, nbytes, "readfrom_mem", addr, memaddr, nbytes, addrsize)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        return self._run(addr, len(buf), "readfrom_mem_into", addr, memaddr, buf, addrsize)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        return self._run(addr, len(buf), "writeto_mem", addr, memaddr, buf, addrsize)
+
+    def coalesce(self, addr):
+        """Defer bulk writes to addr until the next flush()"""
+        self._coalesced.add(addr)
+
+    def flush(self):
+        """Send the latest deferred write for each coalesced device.
+
+        Call once per loop after all short transactions are done.
+        """
+        sent = 0
+        while self._pending:
+            addr, (vector, stop) = self._pending.popitem()
+            self._run(addr, sum(len(b) for b in vector), "writevto", addr, vector, stop)
+            sent += 1
+        return sent
+
+    def stats(self):
+        """Return {addr: (transactions, errors, bytes)} and overall bytes/s"""
+        elapsed = time.ticks_diff(time.ticks_ms(), self._start) / 1000
+        total = sum(entry[2] for entry in self._stats.values())
+        per_device = {addr: tuple(entry) for addr, entry in self._stats.items()}
+        return per_device, (total / elapsed if elapsed > 0 else 0)
+
+    def summary(self):
+        per_device, rate = self.stats()
+        parts = []
+        for addr, (count, errors, nbytes) in per_device.items():
+            name = hex(addr) if addr is not None else "scan"
+            parts.append("{} {} tx/{} err/{} B".format(name, count, errors, nbytes))
+        parts.append("{:.0f} B/s, {} recoveries".format(rate, self.recoveries))
+        return ", ".join(parts)
@@ -1,11 +1,10 @@
 import machine
 import time
-import network
-import socket
-from machine import Pin, I2C, ADC, PWM
+import gc
+from machine import Pin, ADC, PWM
 import onewire
 import ds18x20
-import ntptime  # For WiFi time sync
+# network, socket and ntptime are imported where first used to speed up boot
 
 # Import custom libraries (you need to upload these to your Pico)
 try:
@@ -14,6 +13,14 @@ try:
 except ImportError:
     print("Please install ssd1306.py and ds3231.py libraries")
 
+# The bus and power managers are required, stop here if they are missing
+try:
+    from i2c_bus import I2CBus
+    from power import PowerManager
+except ImportError:
+    print("Please install i2c_bus.py and power.py libraries")
+    raise
+
 # WiFi Configuration
 SSID = "OPPO A58"  # Replace with your WiFi name
 PASSWORD = "e96vpnt7"  # Replace with your WiFi password
@@ -22,23 +29,44 @@ PASSWORD = "e96vpnt7"  # Replace with your WiFi password
 WATER_HIGH_THRESHOLD = 5   # If distance < 5cm, water level is HIGH
 WATER_LOW_THRESHOLD = 20   # If distance > 20cm, water level is LOW
 
+# Scheduling (tank conditions change slowly, so sample sparingly)
+SAMPLE_INTERVAL_MS = 30000   # Sensor sampling period
+DISPLAY_INTERVAL_MS = 1000   # OLED refresh period (clock shows seconds)
+STATUS_INTERVAL_MS = 10000   # Console status update period
+FEED_TIMES = []              # Scheduled feeds as (hour, minute), e.g. [(8, 0), (18, 0)]
+FEED_DURATION_S = 10         # How long a scheduled feed cycles the servo
+
+# Power saving
+LOW_POWER = True             # Use machine.lightsleep when idle (disable while on the USB REPL)
+DISPLAY_DIM_AFTER_S = 60     # Dim the OLED after this long without activity
+DISPLAY_OFF_AFTER_S = 300    # Power off the OLED after this long without activity
+SERVO_SETTLE_MS = 500        # Time for the servo to reach neutral before its PWM is stopped
+
 # Hardware Setup
-# I2C for OLED and RTC
-i2c = I2C(0, scl=Pin(5), sda=Pin(4), freq=400000)
+# I2C for OLED and RTC (shared through the bus manager)
+i2c = I2CBus(0, scl=5, sda=4, freq=400000)
+print("I2C devices:", [hex(addr) for addr in i2c.devices])
 
 # OLED Display
-try:
-    oled = SSD1306_I2C(128, 64, i2c)
-except:
+oled = None
+if 0x3C in i2c.devices:  # Reuse the boot scan instead of probing again
+    try:
+        oled = SSD1306_I2C(128, 64, i2c)
+        i2c.coalesce(oled.addr)  # Frames are sent once per loop by i2c.flush()
+    except:
+        print("OLED init failed!")
+else:
     print("OLED not found!")
-    oled = None
 
 # RTC DS3231
-try:
-    rtc = DS3231(i2c)
-except:
+rtc = None
+if 0x68 in i2c.devices:
+    try:
+        rtc = DS3231(i2c)
+    except:
+        print("RTC init failed!")
+else:
     print("RTC not found!")
-    rtc = None
 
 # Servo Motor
 servo = PWM(Pin(15))
@@ -58,16 +86,46 @@ echo = Pin(19, Pin.IN)
 # Push Button
 button = Pin(14, Pin.IN, Pin.PULL_UP)
 
+# Power Manager
+power = PowerManager(oled, DISPLAY_DIM_AFTER_S, DISPLAY_OFF_AFTER_S, lightsleep=LOW_POWER)
+
 # Global Variables
 feeding_mode = False
-last_button_state = 1
+last_button_ms = 0
 button_pressed = False
 servo_step = 0  # Track current servo position
+readings = {"temp": None, "distance": None, "turbidity": None, "voltage": None, "sampled_ms": None}
+
+# Static HTTP response parts, kept as bytes and streamed to the socket as-is
+HTTP_JSON_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n"
+HTTP_HTML_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n"
+HTTP_ERROR_HEADER = b"HTTP/1.1 500 Internal Server Error\r\nContent-Type: application/json\r\n\r\n"
+FEED_STARTED_JSON = b'{"status":"feeding","message":"Feed started"}'
+FEED_STOPPED_JSON = b'{"status":"stopped","message":"Feed stopped"}'
+HTML_HEAD = b"""<html><head><title>Fish Feeder API</title></head><body>
+<h1>&#x1F420; Automated Fish Feeder API</h1>
+<h2>Current Status:</h2>
+<ul>
+"""
+HTML_TAIL = b"""</ul>
+<h2>Available Endpoints:</h2>
+<ul>
+    <li><a href="/status">/status</a> - Get current system status (JSON)</li>
+    <li><a href="/feed">/feed</a> - Start feeding fish</li>
+    <li><a href="/stop">/stop</a> - Stop feeding</li>
+</ul>
+</body></html>
+"""
 
 def connect_wifi():
     """Connect to WiFi network and sync time"""
+    import network
     wlan = network.WLAN(network.STA_IF)
     wlan.active(True)
+    try:
+        wlan.config(pm=wlan.PM_POWERSAVE)  # Radio wakes on DTIM, keeps association
+    except Exception:
+        pass
    
     if not wlan.isconnected():
         print('Connecting to WiFi...')
@@ -87,6 +145,7 @@ def connect_wifi():
         # Sync time with internet
         try:
             print("Syncing time with internet...")
+            import ntptime
             ntptime.settime()  # Get time from NTP server
             print("Time synced successfully!")
            
@@ -115,13 +174,14 @@ def connect_wifi():
 
 def create_web_server():
     """Create HTTP server for MIT App Inventor communication"""
+    import socket
     try:
         addr = socket.getaddrinfo('0.0.0.0', 80)[0][-1]
         s = socket.socket()
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         s.bind(addr)
         s.listen(1)
-        s.settimeout(0.01)  # Non-blocking timeout
+        s.settimeout(0)  # Non-blocking, the loop sleeps between polls
         print('Web server listening on', addr)
         return s
     except Exception as e:
@@ -139,11 +199,12 @@ def handle_web_request(conn):
        
         # Parse the request path
         if 'GET /status' in request:
-            # Get all sensor readings
-            temp = read_temperature()
-            distance = measure_water_distance()
+            # Get all sensor readings (cached, see SAMPLE_INTERVAL_MS)
+            cached = get_readings()
+            temp = cached["temp"]
+            distance = cached["distance"]
             water_status = get_water_status(distance)
-            turbidity, voltage = read_turbidity()
+            turbidity, voltage = cached["turbidity"], cached["voltage"]
             time_str = get_time_string()
            
             # Determine water clarity
@@ -169,63 +230,51 @@ def handle_web_request(conn):
            
             print("Sending data:", response_json)  # Debug output
            
-            response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n"
-            response += response_json
+            conn.send(HTTP_JSON_HEADER)
+            conn.send(response_json.encode())
            
         elif 'GET /feed' in request:
             # Start feeding
             feeding_mode = True
             print("Feeding activated via web request")
-            response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n"
-            response += '{"status":"feeding","message":"Feed started"}'
+            conn.send(HTTP_JSON_HEADER)
+            conn.send(FEED_STARTED_JSON)
            
         elif 'GET /stop' in request:
             # Stop feeding
             feeding_mode = False
             servo.duty_u16(4920)  # Return to neutral position
             print("Feeding stopped via web request")
-            response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n"
-            response += '{"status":"stopped","message":"Feed stopped"}'
+            conn.send(HTTP_JSON_HEADER)
+            conn.send(FEED_STOPPED_JSON)
            
         else:
             # Default response with current status
-            temp = read_temperature()
-            distance = measure_water_distance()
+            cached = get_readings()
+            temp = cached["temp"]
+            distance = cached["distance"]
             water_status = get_water_status(distance)
-            response = "HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n"
-            response += """
-            <html><head><title>Fish Feeder API</title></head><body>
-            <h1>🐠 Automated Fish Feeder API</h1>
-            <h2>Current Status:</h2>
-            <ul>
-                <li>Temperature: {}°C</li>
-                <li>Water Level: {}cm ({})</li>
-                <li>Time: {}</li>
-                <li>Feeding: {}</li>
-            </ul>
-            <h2>Available Endpoints:</h2>
-            <ul>
-                <li><a href="/status">/status</a> - Get current system status (JSON)</li>
-                <li><a href="/feed">/feed</a> - Start feeding fish</li>
-                <li><a href="/stop">/stop</a> - Stop feeding</li>
-            </ul>
-            </body></html>
-            """.format(
+            status_items = """    <li>Temperature: {}&deg;C</li>
+    <li>Water Level: {}cm ({})</li>
+    <li>Time: {}</li>
+    <li>Feeding: {}</li>
+""".format(
                 temp if temp is not None else "Error",
                 distance if distance is not None else "Error",
                 water_status,
                 get_time_string(),
                 "Active" if feeding_mode else "Stopped"
             )
-       
-        conn.send(response.encode())
+            conn.send(HTTP_HTML_HEADER)
+            conn.send(HTML_HEAD)
+            conn.send(status_items.encode())
+            conn.send(HTML_TAIL)
        
     except Exception as e:
         print("Web request error:", e)
         try:
-            error_response = "HTTP/1.1 500 Internal Server Error\r\nContent-Type: application/json\r\n\r\n"
-            error_response += '{{"error":"Internal server error","message":"{}"}}'.format(str(e))
-            conn.send(error_response.encode())
+            conn.send(HTTP_ERROR_HEADER)
+            conn.send('{{"error":"Internal server error","message":"{}"}}'.format(str(e)).encode())
         except:
             pass
    
@@ -350,6 +399,37 @@ def get_time_string():
         t = time.localtime()
         return "{:02d}:{:02d}:{:02d}".format(t[3], t[4], t[5])
 
+def seconds_until_next_feed():
+    """Seconds until the next entry in FEED_TIMES, or None if none scheduled"""
+    if not FEED_TIMES:
+        return None
+    try:
+        if rtc:
+            dt = rtc.get_time()
+            now_s = dt[4] * 3600 + dt[5] * 60 + dt[6]
+        else:
+            t = time.localtime()
+            now_s = t[3] * 3600 + t[4] * 60 + t[5]
+    except:
+        t = time.localtime()
+        now_s = t[3] * 3600 + t[4] * 60 + t[5]
+    # Always strictly in the future so a feed never triggers twice
+    return min((h * 3600 + m * 60 - now_s - 1) % 86400 + 1 for h, m in FEED_TIMES)
+
+def sample_sensors():
+    """Read all tank sensors into the shared readings cache"""
+    readings["temp"] = read_temperature()
+    readings["distance"] = measure_water_distance()
+    readings["turbidity"], readings["voltage"] = read_turbidity()
+    readings["sampled_ms"] = time.ticks_ms()
+
+def get_readings():
+    """Return the readings cache, resampling only if it is older than SAMPLE_INTERVAL_MS"""
+    sampled = readings["sampled_ms"]
+    if sampled is None or time.ticks_diff(time.ticks_ms(), sampled) >= SAMPLE_INTERVAL_MS:
+        sample_sensors()
+    return readings
+
 def get_date_string():
     """Get formatted date from RTC or system time"""
     try:
@@ -377,14 +457,14 @@ def display_normal_info():
         oled.text("Date: " + date_str, 0, 8)
        
         # Display temperature
-        temp = read_temperature()
+        temp = readings["temp"]
         if temp is not None:
             oled.text("Temp: {:.1f}C".format(temp), 0, 18)
         else:
             oled.text("Temp: Error", 0, 18)
        
         # Display water level status
-        distance = measure_water_distance()
+        distance = readings["distance"]
         water_status = get_water_status(distance)
        
         if distance is not None:
@@ -403,7 +483,7 @@ def display_normal_info():
             oled.text("Level: ERROR", 0, 38)
        
         # Display turbidity on last line
-        turbidity, voltage = read_turbidity()
+        turbidity, voltage = readings["turbidity"], readings["voltage"]
         if turbidity is not None and voltage is not None:
             if voltage < 1.5:
                 oled.text("Water: Very Dirty", 0, 48)
@@ -425,7 +505,7 @@ def display_feeding_info():
         oled.text("ACTIVE!", 35, 18)
        
         # Show water level during feeding
-        distance = measure_water_distance()
+        distance = readings["distance"]
         water_status = get_water_status(distance)
        
         if distance is not None:
@@ -444,17 +524,19 @@ def display_feeding_info():
         oled.text("Press to STOP", 15, 58)
         oled.show()
 
-def check_button():
-    """Check button press with debouncing"""
-    global last_button_state, button_pressed
-   
-    current_state = button.value()
+def button_irq(pin):
+    """Button IRQ handler with debouncing (also wakes the Pico from lightsleep)"""
+    global last_button_ms, button_pressed
    
-    if last_button_state == 1 and current_state == 0:  # Button pressed
+    now = time.ticks_ms()
+    if time.ticks_diff(now, last_button_ms) > 200:  # Debounce window
         button_pressed = True
-        time.sleep(0.2)  # Debounce delay
-   
-    last_button_state = current_state
+        last_button_ms = now
+
+button.irq(trigger=Pin.IRQ_FALLING, handler=button_irq)
+
+def check_button():
+    """Check whether the button IRQ recorded a press"""
     return button_pressed
 
 def setup_rtc():
@@ -470,7 +552,7 @@ def setup_rtc():
 
 def check_water_level_alerts():
     """Check water level and print alerts to console"""
-    distance = measure_water_distance()
+    distance = readings["distance"]
     water_status = get_water_status(distance)
    
     if water_status == "LOW":
@@ -480,24 +562,40 @@ def check_water_level_alerts():
     elif water_status == "ERROR":
         print("❌ ALERT: Water level sensor error - Check HC-SR04 connections")
 
+def show_splash():
+    """Draw the first frame before the (slow) WiFi connection"""
+    if oled:
+        oled.fill(0)
+        oled.text("FISH FEEDER", 20, 20)
+        oled.text("Connecting...", 12, 36)
+        oled.show()
+        i2c.flush()
+
+def report_boot_stats(first_frame_ms, wifi_ms):
+    """Print boot phases and heap after boot to compare releases.
+
+    Times are ticks_ms() since reset, so source and .mpy builds (including
+    compiling main.py) are measured alike; compare after a hard reset, as
+    ticks_ms() keeps counting across a soft reboot (Ctrl-D).
+    """
+    print(f"⏱️ Boot: ready {boot_ready_ms} ms, first frame {first_frame_ms} ms after reset, WiFi {wifi_ms} ms, heap free {boot_heap_free} B, used {boot_heap_used} B")
+
 def main():
     """Main program loop"""
     global feeding_mode, button_pressed, servo_step
    
     print("🐠 Automated Fish Feeding System Starting...")
-    print("📡 MIT App Inventor Compatible Version")
-    print("=" * 50)
-    print("Water Level Sensor Configuration:")
-    print(f"  HIGH:   Distance < {WATER_HIGH_THRESHOLD}cm (sensor close to water)")
-    print(f"  NORMAL: Distance {WATER_HIGH_THRESHOLD}-{WATER_LOW_THRESHOLD}cm (good water level)")
-    print(f"  LOW:    Distance > {WATER_LOW_THRESHOLD}cm (need to add water)")
-    print("=" * 50)
+    print(f"Water level: HIGH < {WATER_HIGH_THRESHOLD}cm, LOW > {WATER_LOW_THRESHOLD}cm")
    
     # Initialize hardware
     setup_rtc()
+    show_splash()
+    first_frame_ms = time.ticks_ms()
    
     # Connect to WiFi
+    wifi_start_ms = time.ticks_ms()
     wifi_connected = connect_wifi()
+    report_boot_stats(first_frame_ms, time.ticks_diff(time.ticks_ms(), wifi_start_ms))
     if wifi_connected:
         print("✅ System ready for MIT App Inventor connection")
     else:
@@ -507,16 +605,9 @@ def main():
     try:
         web_server = create_web_server()
         if web_server:
-            print("✅ Web server started successfully!")
-            print("🌐 MIT App Inventor Test URLs:")
-            wlan = network.WLAN(network.STA_IF)
-            ip = wlan.ifconfig()[0]
-            print(f"   📊 Status: http://{ip}/status")
-            print(f"   🍽️  Feed:   http://{ip}/feed")
-            print(f"   ⏹️  Stop:   http://{ip}/stop")
-            print("=" * 50)
-            print("📱 Update your MIT App Inventor PICO_IP to:", ip)
-            print("=" * 50)
+            import network
+            ip = network.WLAN(network.STA_IF).ifconfig()[0]
+            print(f"🌐 Web server on http://{ip}/ (/status, /feed, /stop), set PICO_IP in the app to {ip}")
         else:
             print("❌ Web server failed to start")
             return
@@ -529,14 +620,15 @@ def main():
     servo_step = 2  # Start at 90 degrees position
    
     print("🚀 System initialized. Starting main loop...")
-    print("🔧 Hardware connections verified:")
-    print("   HC-SR04: Trig→GPIO18, Echo→GPIO19, VCC→VBUS(5V), GND→GND")
-    print("   DS18B20: Data→GPIO22, VCC→3.3V, GND→GND")
-    print("   Servo: Signal→GPIO15, VCC→VBUS(5V), GND→GND")
-    print("=" * 50)
    
-    alert_counter = 0  # Counter to reduce alert frequency
-    status_counter = 0  # Counter for periodic status updates
+    # Deadlines (time.ticks_ms) for the scheduled work
+    now = time.ticks_ms()
+    next_sample = now
+    next_display = now
+    next_status = time.ticks_add(now, STATUS_INTERVAL_MS)
+    next_feed = None
+    feed_stop = None  # Set while a scheduled feed is running
+    servo_release = None  # When the neutral servo's PWM may be stopped
    
     while True:
         try:
@@ -552,7 +644,9 @@ def main():
             # Check button press
             if check_button():
                 button_pressed = False  # Reset flag
+                power.activity()
                 feeding_mode = not feeding_mode  # Toggle mode
+                feed_stop = None  # Manual control overrides a scheduled feed
                
                 if feeding_mode:
                     print("🍽️ FEEDING MODE ACTIVATED - Motor cycling through positions")
@@ -565,28 +659,76 @@ def main():
                     servo.duty_u16(4920)  # 90 degrees - working value
                     servo_step = 2  # Reset to 90 degree position
            
+            now = time.ticks_ms()
+           
+            # Scheduled feeds
+            if next_feed is None and feed_stop is None:
+                seconds = seconds_until_next_feed()
+                if seconds is not None:
+                    next_feed = time.ticks_add(now, seconds * 1000)
+            if next_feed is not None and time.ticks_diff(now, next_feed) >= 0:
+                print("⏰ Scheduled feed started")
+                next_feed = None
+                feed_stop = time.ticks_add(now, FEED_DURATION_S * 1000)
+                feeding_mode = True
+                servo_step = 0
+            if feed_stop is not None and time.ticks_diff(now, feed_stop) >= 0:
+                print("⏰ Scheduled feed finished")
+                feed_stop = None
+                feeding_mode = False
+                servo.duty_u16(4920)
+                servo_step = 2
+           
+            # Sample sensors and check water level alerts
+            if time.ticks_diff(now, next_sample) >= 0:
+                sample_sensors()
+                check_water_level_alerts()
+                next_sample = time.ticks_add(now, SAMPLE_INTERVAL_MS)
+           
+            if time.ticks_diff(now, next_status) >= 0:
+                temp = readings["temp"]
+                distance = readings["distance"]
+                water_status = get_water_status(distance)
+                print(f"📊 Status Update - Temp: {temp}°C, Water: {distance}cm ({water_status}), Feeding: {feeding_mode}")
+                print("🔌 I2C:", i2c.summary())
+                print("🔋 Power:", power.summary())
+                next_status = time.ticks_add(now, STATUS_INTERVAL_MS)
+           
             # Display appropriate information and handle motor
             if feeding_mode:
+                power.activity()  # Keep the display lit while feeding
                 display_feeding_info()
+                i2c.flush()  # All reads are done, send this iteration's frame once
                 servo_feed_continuous()  # Keep motor running through positions
-            else:
+                servo_release = None
+                time.sleep(0.1)  # PWM must keep running, so no lightsleep here
+                continue
+           
+            display_lit = power.update_display()
+            if display_lit and time.ticks_diff(now, next_display) >= 0:
                 display_normal_info()
+                next_display = time.ticks_add(now, DISPLAY_INTERVAL_MS)
            
-            status_counter += 1
-            if status_counter >= 100:  # Every 10 seconds (100 * 0.1s)
-                temp = read_temperature()
-                distance = measure_water_distance()
-                water_status = get_water_status(distance)
-                print(f"📊 Status Update - Temp: {temp}°C, Water: {distance}cm ({water_status}), Feeding: {feeding_mode}")
-                status_counter = 0
+            i2c.flush()  # All reads are done, send this iteration's frame once
            
-            # Check water level alerts every 50 cycles (reduce console spam)
-            alert_counter += 1
-            if alert_counter >= 50:
-                check_water_level_alerts()
-                alert_counter = 0
+            # Sleep until the next piece of scheduled work (button IRQ wakes early)
+            deadline = next_sample
+            for other in (next_display if display_lit else None, next_status, next_feed):
+                if other is not None and time.ticks_diff(other, deadline) < 0:
+                    deadline = other
            
-            time.sleep(0.1)  # Small delay to prevent excessive CPU usage
+            # lightsleep freezes the PWM line, which can make the servo twitch or
+            # run to an end stop. Give it SERVO_SETTLE_MS to reach neutral, then
+            # stop the pulses (duty 0) so it idles unpowered while we sleep.
+            servo_driven = servo.duty_u16() != 0
+            if servo_driven:
+                if servo_release is None:
+                    servo_release = time.ticks_add(now, SERVO_SETTLE_MS)
+                elif time.ticks_diff(now, servo_release) >= 0:
+                    servo.duty_u16(0)
+                    servo_driven = False
+                    servo_release = None
+            power.idle(deadline, lightsleep=not servo_driven)
            
         except KeyboardInterrupt:
             print("\n🛑 System stopped by user")
@@ -602,6 +744,12 @@ def main():
             print("🔄 Continuing operation...")
             time.sleep(1)
 
+# Boot phase ends here: modules imported and hardware set up
+gc.collect()
+boot_ready_ms = time.ticks_ms()
+boot_heap_free = gc.mem_free()
+boot_heap_used = gc.mem_alloc()
+
 # Run the main program
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+# Low-power idle manager for MicroPython
+from micropython import const
+import machine
+import time
+
+# Rough current figures in mA, tune for your hardware
+_AWAKE_MA = const(45)  # RP2040 running + CYW43 in power-save
+_SLEEP_MA = const(8)  # RP2040 in lightsleep + CYW43 in power-save
+_OLED_MA = (12, 4, 0)  # display on, dimmed, off
+
+DISPLAY_ON = const(0)
+DISPLAY_DIM = const(1)
+DISPLAY_OFF = const(2)
+
+class PowerManager:
+    """Sleeps between scheduled work and dims the display when idle.
+
+    Sleeps are capped at max_sleep_ms so the web server is polled often
+    enough to stay responsive; pin IRQs (the button) wake the CPU early.
+    Time spent awake, asleep and in each display state is tracked to
+    estimate the average current draw.
+    """
+
+    def __init__(self, display=None, dim_after_s=60, off_after_s=300,
+                 max_sleep_ms=200, dim_contrast=0x10, lightsleep=True):
+        self.display = display
+        self.dim_after_ms = dim_after_s * 1000
+        self.off_after_ms = off_after_s * 1000
+        self.max_sleep_ms = max_sleep_ms
+        self.dim_contrast = dim_contrast
+        self.lightsleep = lightsleep
+        self.display_state = DISPLAY_ON
+        self._awake_ms = 0
+        self._sleep_ms = 0
+        self._display_ms = [0, 0, 0]
+        self._last = time.ticks_ms()
+        self._last_activity = self._last
+
+    def _account(self, slept_ms=0):
+        now = time.ticks_ms()
+        elapsed = time.ticks_diff(now, self._last)
+        self._last = now
+        self._sleep_ms += slept_ms
+        self._awake_ms += max(elapsed - slept_ms, 0)
+        self._display_ms[self.display_state] += elapsed
+        return now
+
+    def _set_display(self, state):
+        if state == self.display_state:
+            return
+        self._account()  # Charge the time so far to the old state
+        if self.display and state == DISPLAY_OFF:
+            self.display.poweroff()
+        elif self.display:
+            if self.display_state == DISPLAY_OFF:
+                self.display.poweron()
+            self.display.contrast(0xFF if state == DISPLAY_ON else self.dim_contrast)
+        self.display_state = state
+
+    def activity(self):
+        """Note user activity and bring the display back to full brightness"""
+        self._last_activity = time.ticks_ms()
+        self._set_display(DISPLAY_ON)
+
+    def update_display(self):
+        """Dim or power off the display after inactivity; True if it is lit"""
+        idle = time.ticks_diff(time.ticks_ms(), self._last_activity)
+        if idle >= self.off_after_ms:
+            self._set_display(DISPLAY_OFF)
+        elif idle >= self.dim_after_ms:
+            self._set_display(DISPLAY_DIM)
+        return self.display_state != DISPLAY_OFF
+
+    def idle(self, deadline, lightsleep=True):
+        """Sleep until the ticks_ms deadline, at most max_sleep_ms.
+
+        Pass lightsleep=False while a PWM output must keep running.
+        """
+        now = self._account()
+        ms = min(time.ticks_diff(deadline, now), self.max_sleep_ms)
+        if ms <= 0:
+            return
+        start = time.ticks_ms()
+        if self.lightsleep and lightsleep:
+            machine.lightsleep(ms)
+            self._account(time.ticks_diff(time.ticks_ms(), start))
+        else:
+            time.sleep_ms(ms)
+            self._account()  # Clocks keep running, charge it as awake
+
+    def average_ma(self):
+        """Estimated average current draw since boot"""
+        self._account()
+        total = self._awake_ms + self._sleep_ms
+        if total <= 0:
+            return 0
+        charge = self._awake_ms * _AWAKE_MA + self._sleep_ms * _SLEEP_MA
+        if self.display:
+            for state in (DISPLAY_ON, DISPLAY_DIM, DISPLAY_OFF):
+                charge += self._display_ms[state] * _OLED_MA[state]
+        return charge / total
+
+    def summary(self):
+        average = self.average_ma()
+        total = self._awake_ms + self._sleep_ms
+        asleep = 100 * self._sleep_ms / total if total else 0
+        return "~{:.1f} mA avg ({:.0f} mAh/day), asleep {:.0f}%".format(
+            average, average * 24, asleep)